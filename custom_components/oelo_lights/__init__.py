@@ -1,9 +1,14 @@
 """Support for Oelo Lights."""
 
 from __future__ import annotations
+import logging
 from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
 
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up the Oelo Lights integration from a config entry."""
     await hass.config_entries.async_forward_entry_setups(entry, ["light"])
@@ -11,4 +16,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    return await hass.config_entries.async_forward_entry_unload(entry, "light")
+    unload_ok = await hass.config_entries.async_forward_entry_unload(entry, "light")
+    if unload_ok and entry.entry_id in hass.data.get(DOMAIN, {}):
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id)
+        await entry_data["coordinator"].async_shutdown()
+        if not entry_data["session"].closed:
+            await entry_data["session"].close()
+        if not hass.data[DOMAIN]:
+            hass.data.pop(DOMAIN)
+        _LOGGER.info("Unloaded Oelo Lights entry %s", entry.entry_id)
+    return unload_ok
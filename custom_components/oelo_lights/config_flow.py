@@ -6,6 +6,9 @@ from typing import Any
 import voluptuous as vol
 import ipaddress
 import asyncio  
+import random
+import re
+import time
 import aiohttp  
 
 from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
@@ -13,11 +16,27 @@ from homeassistant.const import CONF_IP_ADDRESS
 from homeassistant.helpers.aiohttp_client import async_get_clientsession 
 from homeassistant.core import HomeAssistant
 from homeassistant import data_entry_flow
+from homeassistant.util.json import json_loads
 
 from .const import DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 
+# Fail fast on dead IPs while still tolerating a slow controller response.
+_PROBE_TIMEOUT = aiohttp.ClientTimeout(connect=2.0, sock_read=3.0, total=6.0)
+_PROBE_ATTEMPTS = 3
+_PROBE_BACKOFF_BASE = 0.5
+_PROBE_BACKOFF_CAP = 4.0
+_PROBE_BACKOFF_JITTER = 0.5
+# Besides 5xx, statuses worth another attempt; any other non-2xx status means this is not a usable Oelo controller.
+_RETRYABLE_STATUSES = (408, 429)
+_VALIDATE_CACHE_TTL = 15.0
+_VALIDATE_CACHE_SIZE = 8
+# Recent successful probes keyed by IP, so re-submitting a form does not hit the controller again.
+_VALIDATE_CACHE: dict[str, tuple[float, dict[str, str]]] = {}
+# Dotted-quad IPv4 without leading zeros, matching what ipaddress accepts.
+_IPV4_RE = re.compile(r"(0|[1-9][0-9]{0,2})\.(0|[1-9][0-9]{0,2})\.(0|[1-9][0-9]{0,2})\.(0|[1-9][0-9]{0,2})")
+
 class CannotConnect(Exception):
     """Exception raised when a connection to the device cannot be established."""
     pass
@@ -27,58 +46,104 @@ class InvalidIP(Exception):
     pass
 
 
-async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, str]:
+def _cache_validation_result(ip: str, result: dict[str, str]) -> None:
+    """Remember a successful probe, evicting stale or oldest entries past the size limit."""
+    now = time.monotonic()
+    _VALIDATE_CACHE.pop(ip, None)
+    _VALIDATE_CACHE[ip] = (now, result)
+    if len(_VALIDATE_CACHE) > _VALIDATE_CACHE_SIZE:
+        for cached_ip, (ts, _) in list(_VALIDATE_CACHE.items()):
+            if now - ts >= _VALIDATE_CACHE_TTL:
+                del _VALIDATE_CACHE[cached_ip]
+        while len(_VALIDATE_CACHE) > _VALIDATE_CACHE_SIZE:
+            del _VALIDATE_CACHE[next(iter(_VALIDATE_CACHE))]
+
+
+async def validate_input(
+    hass: HomeAssistant, data: dict[str, Any], use_cache: bool = True
+) -> dict[str, str]:
     """Validate user input allows us to connect."""
 
     ip = data.get(CONF_IP_ADDRESS)
     if not ip:
         raise InvalidIP("No IP address provided.")
 
-    try:
-        ipaddress.ip_address(ip)
-    except ValueError:
-        _LOGGER.debug("Invalid IP address format: %s", ip)
-        raise InvalidIP("Invalid IP address format.")
+    match = _IPV4_RE.fullmatch(ip)
+    if match is None or not all(int(octet) <= 255 for octet in match.groups()):
+        # Not a plain dotted quad; let ipaddress handle IPv6 and reject anything else.
+        try:
+            ipaddress.ip_address(ip)
+        except ValueError:
+            _LOGGER.debug("Invalid IP address format: %s", ip)
+            raise InvalidIP("Invalid IP address format.")
+
+    if use_cache:
+        cached = _VALIDATE_CACHE.get(ip)
+        if cached is not None and time.monotonic() - cached[0] < _VALIDATE_CACHE_TTL:
+            _LOGGER.debug("Using cached validation result for %s", ip)
+            return dict(cached[1])
 
     session = async_get_clientsession(hass)
     controller_url = f"http://{ip}/getController"
 
-    try:
-        _LOGGER.debug("Attempting to connect to Oelo controller at %s", controller_url)
-        timeout = aiohttp.ClientTimeout(total=10, connect=5)
-        async with session.get(controller_url, timeout=timeout) as response:
-            if response.status == 200:
-                try:
-                    # Try to parse response as JSON to verify it's an Oelo controller
-                    data = await response.json(content_type=None)
-                    if isinstance(data, list):
-                        _LOGGER.debug("Successfully connected to Oelo controller at %s", ip)
-                        return {"title": "Oelo Lights"} 
-                    else:
+    async def _probe() -> int:
+        """Issue one reachability probe and return the HTTP status."""
+        async with session.head(controller_url, allow_redirects=False, timeout=_PROBE_TIMEOUT) as response:
+            status = response.status
+        if status == 405:
+            # Some firmware builds only answer GET; confirm it is an Oelo controller while we are at it.
+            _LOGGER.debug("HEAD not allowed by %s, retrying with GET", ip)
+            async with session.get(controller_url, timeout=_PROBE_TIMEOUT) as response:
+                status = response.status
+                if 200 <= status < 300:
+                    # Only a JSON list proves this is an Oelo controller.
+                    try:
+                        data = json_loads(await response.read())
+                    except ValueError as err:
+                        _LOGGER.warning("Invalid JSON response from %s: %s", ip, err)
+                        raise CannotConnect("Device responded but doesn't appear to be an Oelo controller")
+                    if not isinstance(data, list):
                         _LOGGER.warning("Unexpected response format from %s", ip)
                         raise CannotConnect("Device responded but doesn't appear to be an Oelo controller")
-                except (aiohttp.ContentTypeError, ValueError) as err:
-                    _LOGGER.warning("Invalid JSON response from %s: %s", ip, err)
-                    raise CannotConnect("Device responded but doesn't appear to be an Oelo controller")
+        return status
+
+    last_error: str = f"Could not connect to the controller at {ip}. Check IP address and ensure device is online."
+    for attempt in range(_PROBE_ATTEMPTS):
+        try:
+            _LOGGER.debug("Probing Oelo controller at %s (attempt %d/%d)", controller_url, attempt + 1, _PROBE_ATTEMPTS)
+            status = await _probe()
+        except CannotConnect:
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            _LOGGER.debug("Probe of Oelo controller at %s failed: %r", ip, err)
+            if isinstance(err, asyncio.TimeoutError):
+                last_error = f"Connection to the controller at {ip} timed out."
             else:
+                last_error = f"Could not connect to the controller at {ip}. Check IP address and ensure device is online."
+        except Exception as exc:
+            _LOGGER.exception("Unexpected error validating Oelo controller at %s: %s", ip, exc)
+            raise
+        else:
+            if 200 <= status < 300:
+                _LOGGER.debug("Successfully reached Oelo controller at %s (HTTP %s)", ip, status)
+                result = {"title": "Oelo Lights"}
+                _cache_validation_result(ip, result)
+                return result
+            last_error = f"Controller responded with status {status}"
+            if status < 500 and status not in _RETRYABLE_STATUSES:
                 _LOGGER.warning(
                     "Failed to connect to Oelo controller at %s - HTTP Status: %s",
                     ip,
-                    response.status,
+                    status,
                 )
-                raise CannotConnect(f"Controller responded with status {response.status}")
+                raise CannotConnect(last_error)
 
-    except (aiohttp.ClientConnectorError, aiohttp.ClientError) as err:
-        _LOGGER.warning(
-            "Failed to connect to Oelo controller at %s: %s", ip, err
-        )
-        raise CannotConnect(f"Could not connect to the controller at {ip}. Check IP address and ensure device is online.")
-    except (asyncio.TimeoutError, aiohttp.ServerTimeoutError) as err:
-        _LOGGER.warning("Timeout connecting to Oelo controller at %s: %s", ip, err)
-        raise CannotConnect(f"Connection to the controller at {ip} timed out.")
-    except Exception as exc:
-        _LOGGER.exception("Unexpected error validating Oelo controller at %s: %s", ip, exc)
-        raise 
+        if attempt < _PROBE_ATTEMPTS - 1:
+            delay = min(_PROBE_BACKOFF_CAP, _PROBE_BACKOFF_BASE * (2 ** attempt))
+            await asyncio.sleep(delay * (1 + random.random() * _PROBE_BACKOFF_JITTER))
+
+    _LOGGER.warning("Failed to connect to Oelo controller at %s: %s", ip, last_error)
+    raise CannotConnect(last_error)
 
 
 STEP_USER_DATA_SCHEMA = vol.Schema({
@@ -118,7 +183,6 @@ class OeloLightsConfigFlow(ConfigFlow, domain=DOMAIN):
             step_id="user",
             data_schema=STEP_USER_DATA_SCHEMA,
             errors=errors,
-            description_placeholders={"error_message": errors.get("base", "")} 
         )
 
 
@@ -134,39 +198,37 @@ class OeloLightsConfigFlow(ConfigFlow, domain=DOMAIN):
             return self.async_abort(reason="entry_not_found")
 
         if user_input is not None:
+            new_ip = user_input.get(CONF_IP_ADDRESS)
+            if config_entry.data.get(CONF_IP_ADDRESS) == new_ip:
+                _LOGGER.debug("Oelo controller IP address unchanged during reconfigure.")
+                return self.async_abort(reason="reconfigure_successful")
 
             current_data = {**config_entry.data, **user_input}
             try:
-                await validate_input(self.hass, current_data)
-
-                if config_entry.data.get(CONF_IP_ADDRESS) != user_input.get(CONF_IP_ADDRESS):
-                     _LOGGER.debug("Oelo controller IP changed from %s to %s",
-                                   config_entry.data.get(CONF_IP_ADDRESS),
-                                   user_input.get(CONF_IP_ADDRESS))
-            
-                     if self._async_current_entries(): 
-                         new_ip = user_input.get(CONF_IP_ADDRESS)
-                         if new_ip:
-                             existing_entry = await self.async_set_unique_id(new_ip, raise_on_progress=False)
-                             if existing_entry and existing_entry.entry_id != config_entry.entry_id:
-                                  errors["base"] = "reconfigure_failed_duplicate_ip"
-                                  return self.async_show_form(
-                                      step_id="reconfigure",
-                                      data_schema=vol.Schema({vol.Required(CONF_IP_ADDRESS, default=user_input.get(CONF_IP_ADDRESS)): str}),
-                                      errors=errors,
-                                      description_placeholders={"ip_address": user_input.get(CONF_IP_ADDRESS)}
-                                  )
-
-                     return self.async_update_reload_and_abort(
-                         config_entry,
-                         unique_id=user_input.get(CONF_IP_ADDRESS), 
-                         data=current_data,
-                         reason="reconfigure_successful",
-                     )
-                else:
-                     _LOGGER.debug("Oelo controller IP address unchanged during reconfigure.")
-                     return self.async_abort(reason="reconfigure_successful")
-
+                # Always re-probe here: the cache must not mask a controller that moved.
+                await validate_input(self.hass, current_data, use_cache=False)
+
+                _LOGGER.debug("Oelo controller IP changed from %s to %s",
+                              config_entry.data.get(CONF_IP_ADDRESS), new_ip)
+
+                for entry in self._async_current_entries():
+                    if entry.entry_id != config_entry.entry_id and entry.unique_id == new_ip:
+                        errors["base"] = "reconfigure_failed_duplicate_ip"
+                        return self.async_show_form(
+                            step_id="reconfigure",
+                            data_schema=self.add_suggested_values_to_schema(
+                                STEP_USER_DATA_SCHEMA, {CONF_IP_ADDRESS: new_ip}
+                            ),
+                            errors=errors,
+                            description_placeholders={"ip_address": new_ip}
+                        )
+
+                return self.async_update_reload_and_abort(
+                    config_entry,
+                    unique_id=new_ip,
+                    data=current_data,
+                    reason="reconfigure_successful",
+                )
 
             except InvalidIP:
                 errors["base"] = "invalid_ip"
@@ -178,6 +240,8 @@ class OeloLightsConfigFlow(ConfigFlow, domain=DOMAIN):
 
         return self.async_show_form(
             step_id="reconfigure",
-            data_schema=vol.Schema({vol.Required(CONF_IP_ADDRESS, default=config_entry.data.get(CONF_IP_ADDRESS)): str}),
+            data_schema=self.add_suggested_values_to_schema(
+                STEP_USER_DATA_SCHEMA, {CONF_IP_ADDRESS: config_entry.data.get(CONF_IP_ADDRESS)}
+            ),
             errors=errors,
         )
\ No newline at end of file
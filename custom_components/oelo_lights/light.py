@@ -3,19 +3,25 @@
 from __future__ import annotations
 import logging
 import asyncio
+import hashlib
+import re
+import sys
+import time
 import aiohttp
-import async_timeout
+from yarl import URL
 import urllib.parse
+from collections.abc import Callable
 from typing import Any
-from homeassistant.const import CONF_IP_ADDRESS, STATE_ON
+from homeassistant.const import CONF_IP_ADDRESS, EVENT_HOMEASSISTANT_CLOSE, STATE_ON
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.device_registry import DeviceInfo
-from homeassistant.helpers import aiohttp_client
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.helpers.update_coordinator import CoordinatorEntity, DataUpdateCoordinator, UpdateFailed
 from homeassistant.helpers.storage import Store
+from homeassistant.util.json import json_loads
 from homeassistant.components.light import (
     ATTR_BRIGHTNESS, ATTR_EFFECT, ATTR_RGB_COLOR, ColorMode, LightEntity, LightEntityFeature
 )
@@ -38,71 +44,439 @@ except ImportError:
         DOMAIN = "oelo_lights"
         _LOGGER.warning("Could not import const.py, using default DOMAIN 'oelo_lights'.")
 
+
+def _query_value(url: str, key: str) -> str:
+    """Return the raw value of a query parameter, or "" when it is absent."""
+    start = url.find(f"?{key}=")
+    if start == -1:
+        start = url.find(f"&{key}=")
+        if start == -1:
+            return ""
+    start += len(key) + 2
+    end = url.find("&", start)
+    return url[start:] if end == -1 else url[start:end]
+
+
+# Normalise each pattern template once; effect lookups and last-command replay reuse these.
+_PATTERN_TEMPLATES: dict[str, str] = {}
+_PATTERNTYPE_TO_EFFECT: dict[str, str] = {}
+for _name, _template in pattern_commands.items():
+    if not isinstance(_template, str) or "{zone}" not in _template:
+        continue
+    _path_start = _template.find("/", _template.find("://") + 3) if "://" in _template else -1
+    # Keep only path and query; the entity supplies the host.
+    if _path_start != -1:
+        _PATTERN_TEMPLATES[_name] = _template[_path_start:]
+    else:
+        _PATTERN_TEMPLATES[_name] = _template if _template.startswith("/") else "/" + _template
+    _pattern_type = _query_value(_template, "patternType")
+    if _pattern_type and _pattern_type != "off":
+        _PATTERNTYPE_TO_EFFECT.setdefault(_pattern_type, _name)
+
+# Shared, read-only effect list returned by every zone.
+_EFFECT_LIST = list(pattern_commands.keys())
+
 SCAN_INTERVAL = timedelta(seconds=30)
+# Zones exposed by every Oelo controller.
+_ZONES = (1, 2, 3, 4, 5, 6)
 STORAGE_KEY_BASE = f"{DOMAIN}_entity_data"
 STORAGE_VERSION = 1
+STORE_SAVE_DELAY = 10
+# Matches the value of the "colors" query parameter (group 2) without parsing the whole URL.
+_COLORS_RE = re.compile(r'([?&]colors=)([^&]*)')
+_ZONES_RE = re.compile(r'([?&]zones=)([^&]*)')
+_NUM_ZONES_RE = re.compile(r'([?&]num_zones=)([^&]*)')
+# Interpreters without the upstream SSL transport leak fix need aiohttp to reap closed transports;
+# newer aiohttp warns when it is requested on fixed versions (same check Home Assistant uses).
+_ENABLE_CLEANUP_CLOSED = (3, 13, 0) <= sys.version_info < (3, 13, 1) or sys.version_info < (3, 12, 7)
+# Fail fast on a dead controller while allowing a slow reply.
+_REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=10, connect=3, sock_read=5)
+# A getController result this recent is reused unless a command was sent since.
+CONTROLLER_CACHE_TTL = 2.0
+# Commands for different zones queued within this window are sent together.
+COMMAND_BATCH_WINDOW = 0.02
+# After the controller rejects a multi-zone command, zones are sent individually for this long.
+MULTI_ZONE_RETRY_AFTER = 300.0
+# Outcomes of a single setPattern request.
+SEND_ACKED = "acked"
+SEND_UNACKED = "unacked"
+SEND_REJECTED = "rejected"
+SEND_FAILED = "failed"
+# State writes requested within this window after the first are folded into one.
+STATE_WRITE_DELAY = 0.05
+# A zone command is sent once no newer one has arrived for this long.
+COMMAND_DEBOUNCE_INTERVAL = 1.0
+# Upper bound on how long a continuous stream of zone commands is held back.
+COMMAND_MAX_DELAY = 2.0
+# Upper bound on the per-entity cache of split command URLs.
+URL_CACHE_SIZE = 32
+# Upper bound on the rendered brightness levels remembered per cached URL.
+RENDER_CACHE_SIZE = 16
+# Scaled channel values indexed by brightness * 256 + channel, rounded to nearest.
+_BRIGHT_LUT = bytes((b * c + 127) // 255 for b in range(256) for c in range(256))
+
+
+def _scale(brightness: int, channel: int) -> int:
+    """Scale a 0-255 channel by a 0-255 brightness."""
+    return _BRIGHT_LUT[brightness * 256 + channel]
+
+
+def _parse_colors(colors_str: str) -> list[int]:
+    """Return the numeric channel values of a "colors" parameter, skipping blanks."""
+    if '%' in colors_str:
+        # Commands stored by older versions were assembled with urlencode and carry "255%2C0%2C0".
+        colors_str = urllib.parse.unquote(colors_str)
+    try:
+        values = list(map(int, filter(None, colors_str.split(','))))
+    except ValueError:
+        values = None
+    if values is None or (values and min(values) < 0):
+        # Something other than plain digits; keep only the tokens that are.
+        return [int(c) for c in (part.strip() for part in colors_str.split(',')) if c.isdigit()]
+    return values
+
+
+def _split_colors_param(url: str) -> tuple[str, tuple[int, ...], str]:
+    """Split a command URL into (text up to the colors value, channel values, rest of the URL)."""
+    match = _COLORS_RE.search(url)
+    if match is None:
+        return url, (), ""
+    start, end = match.span(2)
+    return url[:start], tuple(_parse_colors(match.group(2))), url[end:]
+
+
+def _first_rgb(colors_str: str) -> tuple[int, int, int] | None:
+    """Return the first colour of a "colors" value, clamped to 0-255, or None if its first three fields aren't integers."""
+    if '%' in colors_str:
+        colors_str = urllib.parse.unquote(colors_str)
+    # Only the first three channels matter; don't convert the rest of a long effect list.
+    parts = colors_str.split(',', 3)
+    if len(parts) < 3:
+        return None
+    try:
+        r, g, b = int(parts[0]), int(parts[1]), int(parts[2])
+    except ValueError:
+        return None
+    return (max(0, min(r, 255)), max(0, min(g, 255)), max(0, min(b, 255)))
+
+
+def _coerce_rgb(value: Any) -> tuple[int, int, int] | None:
+    """Return a restored rgb_color attribute as an int triple, or None if it is not one."""
+    if type(value) is list and len(value) == 3:
+        # What the recorder hands back: skip the generic checks below.
+        r, g, b = value
+        if type(r) is int and type(g) is int and type(b) is int and 0 <= r <= 255 and 0 <= g <= 255 and 0 <= b <= 255:
+            return (r, g, b)
+    if not isinstance(value, (list, tuple)) or len(value) != 3:
+        return None
+    try:
+        rgb = tuple(int(c) for c in value)
+    except (ValueError, TypeError):
+        return None
+    # Out-of-range channels would index past their _BRIGHT_LUT row; report them like any other bad value.
+    return rgb if all(0 <= c <= 255 for c in rgb) else None
+
+
+# First colour of each effect, reported as the entity's rgb_color while the effect runs.
+_EFFECT_FIRST_RGB: dict[str, tuple[int, int, int] | None] = {
+    _name: _first_rgb(_query_value(_template, "colors")) for _name, _template in _PATTERN_TEMPLATES.items()
+}
+
+
+def _create_session() -> aiohttp.ClientSession:
+    """Return a keep-alive session for one Oelo controller; the caller owns and closes it."""
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit_per_host=4,
+            keepalive_timeout=60,
+            enable_cleanup_closed=_ENABLE_CLEANUP_CLOSED,
+        ),
+        headers={"Connection": "keep-alive"},
+    )
+
 
 class OeloDataUpdateCoordinator(DataUpdateCoordinator):
-    def __init__(self, hass: HomeAssistant, session: aiohttp.ClientSession, ip: str) -> None:
+    def __init__(self, hass: HomeAssistant, ip: str, session: aiohttp.ClientSession) -> None:
         super().__init__(
             hass,
             _LOGGER,
             name=f"Oelo Controller {ip}",
             update_interval=SCAN_INTERVAL,
+            always_update=False,
         )
+        # Owned by the config entry, not the coordinator; closed when the entry unloads.
         self.session = session
         self.ip = ip
+        self._controller_url = f"http://{ip}/getController"
+        self._last_hash: bytes | None = None
+        self._etag: str | None = None
+        # Send failures are logged at warning level once, then at debug until a command succeeds again.
+        self._send_failing = False
+        self._fetched_at = 0.0
+        # Bumped as each command completes, so the next poll skips the cache and notifies listeners.
+        self._command_seq = 0
+        self.batcher = OeloCommandBatcher(hass, self.async_send)
 
     async def _async_update_data(self):
-        url = f"http://{self.ip}/getController"
+        if (
+            self.data is not None
+            and self.data["command_seq"] == self._command_seq
+            and time.monotonic() - self._fetched_at < CONTROLLER_CACHE_TTL
+        ):
+            return self.data
+        # Only revalidate against a payload we actually hold; a 304 with nothing cached is useless.
+        headers = {"If-None-Match": self._etag} if self._etag and self.data is not None else None
         try:
-            async with async_timeout.timeout(10):
-                async with self.session.get(url) as response:
-                    response.raise_for_status()
-                    data = await response.json(content_type=None)
-                    if not isinstance(data, list):
-                        raise UpdateFailed("Controller did not return a list")
-                    return data
+            async with self.session.get(self._controller_url, headers=headers, timeout=_REQUEST_TIMEOUT) as response:
+                if response.status == 304 and self.data is not None:
+                    self._fetched_at = time.monotonic()
+                    return self._unchanged_data()
+                response.raise_for_status()
+                etag = response.headers.get("ETag")
+                body = await response.read()
+            self._fetched_at = time.monotonic()
+            # Firmware without ETag support: fall back to comparing a digest of the body.
+            new_hash = hashlib.blake2b(body, digest_size=8).digest()
+            if new_hash == self._last_hash and self.data is not None:
+                self._etag = etag
+                return self._unchanged_data()
+            data = json_loads(body)
+            if not isinstance(data, list):
+                raise UpdateFailed("Controller did not return a list")
+            # Remember the validators only for a body that decoded; otherwise the next poll refetches.
+            self._last_hash = new_hash
+            self._etag = etag
+            by_zone = {}
+            for item in data:
+                # Firmware always reports dicts with "num"; only pay for malformed entries.
+                try:
+                    # int() so a firmware reporting "num" as a string still matches the entity's zone.
+                    by_zone[int(item["num"])] = item
+                except (TypeError, KeyError, ValueError):
+                    continue
+            return {
+                "list": data,
+                "by_zone": by_zone,
+                "command_seq": self._command_seq,
+            }
         except Exception as err:
             raise UpdateFailed(f"Error communicating with Oelo controller: {err}")
 
+    def _unchanged_data(self) -> dict[str, Any]:
+        """Return the current data for an identical payload, skipping the JSON decode."""
+        if self.data["command_seq"] == self._command_seq:
+            return self.data
+        return {**self.data, "command_seq": self._command_seq}
+
+    async def async_queue_command(self, zone: int, url: str) -> bool:
+        """Queue a zone command; commands queued within the batch window share one request."""
+        return await self.batcher.queue(zone, url)
+
+    async def async_send(self, url: str) -> str:
+        """Send one setPattern command and return its SEND_* outcome."""
+        log_prefix = self.name
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("%s: Sending request: %s", log_prefix, url)
+        try:
+            session = self.session
+            if session is None or session.closed:
+                 _LOGGER.error("%s: HTTP session closed/invalid for send request.", log_prefix)
+                 return SEND_FAILED
+
+            # Command URLs are built here from ASCII and already-escaped values, so skip aiohttp's requoting pass.
+            async with session.get(URL(url, encoded=True), timeout=_REQUEST_TIMEOUT) as response:
+                response.raise_for_status()
+                # Read the (short) body in full so the connection goes back to the keep-alive pool;
+                # only its start is checked and logged, without decoding the rest.
+                chunk = (await response.read())[:64]
+
+                if self._send_failing:
+                    self._send_failing = False
+                    _LOGGER.info("%s: Controller is accepting commands again.", log_prefix)
+                if b"Command Received" in chunk:
+                     if _LOGGER.isEnabledFor(logging.INFO):
+                         _LOGGER.info("%s: Request OK (Status: %d, Resp: '%s')", log_prefix, response.status,
+                                      chunk.decode('latin-1', 'ignore').strip()[:50])
+                     return SEND_ACKED
+                else:
+                     _LOGGER.warning("%s: Request OK (Status: %d), but unexpected response: '%s'", log_prefix, response.status,
+                                     chunk.decode('latin-1', 'ignore').strip()[:50])
+                     return SEND_UNACKED
+        except asyncio.TimeoutError:
+            self._log_send_failure("Request timed out", None, url)
+            return SEND_FAILED
+        except aiohttp.ClientResponseError as err:
+            self._log_send_failure("HTTP request failed", err, url)
+            # A 4xx means the controller understood and refused the command; 5xx may be transient.
+            return SEND_REJECTED if 400 <= err.status < 500 else SEND_FAILED
+        except aiohttp.ClientConnectionError as err:
+            self._log_send_failure("HTTP connection failed", err, url)
+            return SEND_FAILED
+        except aiohttp.ClientError as err:
+            self._log_send_failure("HTTP client error", err, url)
+            return SEND_FAILED
+        except Exception as err:
+            self._log_send_failure("Unexpected error during request", err, url)
+            return SEND_FAILED
+        finally:
+            # Only once the controller has answered (or given up): a poll overlapping the request
+            # must not carry the new seq, or its pre-command data would pass as the confirmation.
+            self._command_seq += 1
+
+    def _log_send_failure(self, message: str, err: Exception | None, url: str) -> None:
+        """Log a failed command at warning level on the first failure and at debug level after that."""
+        # Tracebacks only help while debugging; formatting them on every failure is wasted work.
+        exc_info = _LOGGER.isEnabledFor(logging.DEBUG)
+        if self._send_failing:
+            _LOGGER.debug("%s: %s: %r (%s)", self.name, message, err, url, exc_info=exc_info)
+            return
+        self._send_failing = True
+        _LOGGER.warning("%s: %s: %r (%s)", self.name, message, err, url, exc_info=exc_info)
+
+    async def async_shutdown(self) -> None:
+        self.batcher.cancel()
+        await super().async_shutdown()
+
+
+class OeloCommandBatcher:
+    """Coalesce per-zone setPattern commands issued within a short window.
+
+    Zones whose commands only differ by zone are sent as one multi-zone request
+    (zones=1,2,3&num_zones=3). If the controller refuses a multi-zone request with a 4xx,
+    its zones are re-sent individually and batching is paused for MULTI_ZONE_RETRY_AFTER
+    seconds. Timeouts and connection errors fail the whole group without a per-zone
+    retry. Each zone's post-send refresh reconciles what was applied.
+    """
+
+    def __init__(self, hass: HomeAssistant, send) -> None:
+        self._hass = hass
+        self._send = send
+        self._pending: dict[int, tuple[str, asyncio.Future]] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._multi_zone_retry_at = 0.0
+
+    def queue(self, zone: int, url: str) -> asyncio.Future:
+        previous = self._pending.get(zone)
+        if previous is not None and not previous[1].done():
+            previous[1].cancel()
+        future = self._hass.loop.create_future()
+        self._pending[zone] = (url, future)
+        if self._flush_handle is None:
+            self._flush_handle = self._hass.loop.call_later(COMMAND_BATCH_WINDOW, self._flush)
+        return future
+
+    def cancel(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        for _, future in self._pending.values():
+            if not future.done():
+                future.cancel()
+        self._pending = {}
+
+    def _flush(self) -> None:
+        self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        groups: dict[str, list[tuple[int, str, asyncio.Future]]] = {}
+        multi_zone = self._hass.loop.time() >= self._multi_zone_retry_at
+        for zone, (url, future) in pending.items():
+            if future.done():
+                continue
+            key = url
+            if multi_zone:
+                key = _ZONES_RE.sub(r"\g<1>", _NUM_ZONES_RE.sub(r"\g<1>", url))
+            groups.setdefault(key, []).append((zone, url, future))
+        if groups:
+            self._hass.async_create_task(self._send_groups(list(groups.values())))
+
+    async def _send_groups(self, groups: list[list[tuple[int, str, asyncio.Future]]]) -> None:
+        """Send one flush's requests back-to-back so they reuse a single keep-alive connection."""
+        for members in groups:
+            await self._send_group(members)
+
+    async def _send_group(self, members: list[tuple[int, str, asyncio.Future]]) -> None:
+        if len(members) == 1:
+            _, url, future = members[0]
+            result = await self._send(url)
+            if not future.done():
+                future.set_result(result in (SEND_ACKED, SEND_UNACKED))
+            return
+
+        zones = ",".join(sorted(str(zone) for zone, _, _ in members))
+        first_url = members[0][1]
+        batched_url = _ZONES_RE.sub(lambda m: m.group(1) + zones, first_url, count=1)
+        batched_url = _NUM_ZONES_RE.sub(lambda m: m.group(1) + str(len(members)), batched_url, count=1)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Sending batched command for zones %s: %s", zones, batched_url)
+        outcome = await self._send(batched_url)
+        if outcome == SEND_FAILED:
+            # Unreachable or transient failure: per-zone retries would only stack more timeouts.
+            for _, _, future in members:
+                if not future.done():
+                    future.set_result(False)
+            return
+        if outcome != SEND_REJECTED:
+            # A 200 without the usual acknowledgement was still applied, as for single-zone commands.
+            for _, _, future in members:
+                if not future.done():
+                    future.set_result(True)
+            return
+
+        _LOGGER.info("Controller refused a multi-zone command; sending zones individually for %d seconds.",
+                     MULTI_ZONE_RETRY_AFTER)
+        self._multi_zone_retry_at = self._hass.loop.time() + MULTI_ZONE_RETRY_AFTER
+        results = []
+        for _, url, _ in members:
+            # Once the controller stops answering, fail the remaining zones instead of waiting on each.
+            results.append(SEND_FAILED if results and results[-1] == SEND_FAILED else await self._send(url))
+        for (_, _, future), result in zip(members, results):
+            if not future.done():
+                future.set_result(result in (SEND_ACKED, SEND_UNACKED))
+
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback,
 ) -> None:
     ip_address = entry.data[CONF_IP_ADDRESS]
-    session = aiohttp_client.async_get_clientsession(hass)
 
-    coordinator = OeloDataUpdateCoordinator(hass, session, ip_address)
-    await coordinator.async_config_entry_first_refresh()
+    session = _create_session()
+    coordinator = OeloDataUpdateCoordinator(hass, ip_address, session)
+    try:
+        await coordinator.async_config_entry_first_refresh()
+    except Exception:
+        await coordinator.async_shutdown()
+        await session.close()
+        raise
+
+    async def _async_close_session(_event) -> None:
+        await session.close()
 
-    if DOMAIN not in hass.data:
-        hass.data[DOMAIN] = {}
+    # Unload closes the session too; this covers Home Assistant stopping with the entry still loaded.
+    entry.async_on_unload(hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_session))
 
     storage_key_for_entry = f"{STORAGE_KEY_BASE}_{entry.entry_id}"
     store = Store(hass, STORAGE_VERSION, storage_key_for_entry)
     stored_entity_data = await store.async_load() or {}
 
-    hass.data[DOMAIN][entry.entry_id] = {
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
         "coordinator": coordinator,
+        "session": session,
         "store": store,
         "stored_entity_data": stored_entity_data,
     }
 
-    light_entities = []
-    for zone in range(1, 7):
-        entity_store_key = f"zone_{zone}_last_command"
-        restored_last_command = stored_entity_data.get(entity_store_key)
-        light_entity = OeloLight(coordinator, zone, entry, restored_last_command)
-        light_entities.append(light_entity)
-    async_add_entities(light_entities, True)
+    light_entities = [
+        OeloLight(coordinator, zone, entry, stored_entity_data.get(f"zone_{zone}_last_command"))
+        for zone in _ZONES
+    ]
+    # The coordinator has already refreshed; entities read its data when added.
+    async_add_entities(light_entities)
 
-class OeloLight(LightEntity, RestoreEntity):
+class OeloLight(CoordinatorEntity[OeloDataUpdateCoordinator], LightEntity, RestoreEntity):
     _attr_has_entity_name = True
-    _attr_should_poll = False
 
     def __init__(self, coordinator: OeloDataUpdateCoordinator, zone: int, entry: ConfigEntry,
                  restored_last_command: str | None = None) -> None:
-        self.coordinator = coordinator
+        super().__init__(coordinator)
         self._zone = zone
         self._entry = entry
         self._state = False
@@ -117,11 +491,33 @@ class OeloLight(LightEntity, RestoreEntity):
         self._attr_name = f"Zone {zone}"
         self._attr_available = True
         self._pending_command_url: str | None = None
-        self._pending_command_future: asyncio.Future | None = None
-        self._debounce_task: asyncio.Task | None = None
-        self._debounce_interval = 1.0
+        self._pending_action: str = ""
+        self._debounce_deadline = 0.0
+        self._first_pending_ts: float | None = None
+        self._wake = asyncio.Event()
+        self._sender_task: asyncio.Task | None = None
+        self._log_prefix: str = self._attr_name
+        self._write_debouncer: Debouncer | None = None
+        self._last_zone_data: dict | None = None
         self._entity_store_key = f"zone_{self._zone}_last_command"
-
+        # Constant for the entity's lifetime: a new IP reloads the entry and recreates the entities.
+        self._base = f"http://{coordinator.ip}"
+        self._off_url = (
+            f"{self._base}/setPattern?patternType=off&num_zones=1&zones={zone}"
+            "&num_colors=1&colors=0,0,0&direction=F&speed=0&gap=0&other=0&pause=0"
+        )
+        self._solid_template = (
+            f"{self._base}/setPattern?patternType=custom&num_zones=1&zones={zone}"
+            "&num_colors=1&colors={colors}&direction=F&speed=0&gap=0&other=0&pause=0"
+        )
+        # Default command when there is nothing to replay; dimmed through the _url_cache renderers.
+        self._white_url = self._solid_template.format(colors="255,255,255")
+        self._effect_url_cache: dict[str, str] = {}
+        # Least-recently-used renderers keyed by raw command URL; see _compile_color_renderer.
+        self._url_cache: dict[str, Callable[[int], str]] = {}
+        # Translation table for the most recent brightness, reused until it changes.
+        self._brightness_lut = _BRIGHT_LUT[255 * 256:]
+        self._brightness_lut_level = 255
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -157,63 +553,74 @@ class OeloLight(LightEntity, RestoreEntity):
 
     @property
     def effect_list(self) -> list[str] | None:
-        return list(pattern_commands.keys()) if self.available else None
+        return _EFFECT_LIST if self.available else None
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
-        self.coordinator.async_add_listener(self._handle_coordinator_update)
+        # entity_id is stable from here on; use it in log lines instead of the zone name.
+        self._log_prefix = self.entity_id or self._attr_name
+        # The first write goes out immediately; writes within the cooldown collapse into one at its end.
+        self._write_debouncer = Debouncer(
+            self.hass,
+            _LOGGER,
+            cooldown=STATE_WRITE_DELAY,
+            immediate=True,
+            function=self.async_write_ha_state,
+        )
+        self._sender_task = self.hass.async_create_background_task(
+            self._sender_loop(), name=f"oelo_lights {self._log_prefix} sender"
+        )
         last_state = await self.async_get_last_state()
-        log_prefix = self.entity_id or self._attr_name
         if last_state:
             self._state = last_state.state == STATE_ON
             self._brightness = last_state.attributes.get(ATTR_BRIGHTNESS, 255)
             self._intended_effect = last_state.attributes.get(ATTR_EFFECT)
             rgb_color_restored = last_state.attributes.get(ATTR_RGB_COLOR)
-            if rgb_color_restored is not None and isinstance(rgb_color_restored, (list, tuple)) and len(rgb_color_restored) == 3:
-                try:
-                    self._rgb_color = tuple(int(c) for c in rgb_color_restored)
-                except (ValueError, TypeError):
-                    _LOGGER.warning("%s: Invalid RGB color %s restored, using default.", log_prefix, rgb_color_restored)
-                    self._rgb_color = (255, 255, 255)
-            else:
-                _LOGGER.debug("%s: No valid RGB in restored state, using default or will derive.", log_prefix)
-                self._rgb_color = (255,255,255)
-
-            _LOGGER.debug("%s: Restored standard attrs: On=%s, Brightness=%s, Effect=%s, RGB=%s. LSC from Store: %s",
-                        log_prefix, self._state, self._brightness, self._intended_effect, self._rgb_color, self._last_successful_command)
-        else:
-            _LOGGER.debug("%s: No previous state found for restore.", log_prefix)
+            self._rgb_color = _coerce_rgb(rgb_color_restored)
             if self._rgb_color is None:
+                if rgb_color_restored is not None:
+                    _LOGGER.warning("%s: Invalid RGB color %s restored, using default.", self._log_prefix, rgb_color_restored)
+                else:
+                    _LOGGER.debug("%s: No RGB in restored state, using default.", self._log_prefix)
                 self._rgb_color = (255, 255, 255)
 
-    async def async_update(self) -> None:
-        await self.coordinator.async_request_refresh()
+            _LOGGER.debug("%s: Restored standard attrs: On=%s, Brightness=%s, Effect=%s, RGB=%s. LSC from Store: %s",
+                        self._log_prefix, self._state, self._brightness, self._intended_effect, self._rgb_color, self._last_successful_command)
+        else:
+            _LOGGER.debug("%s: No previous state found for restore.", self._log_prefix)
+        # The first refresh ran before the entity was added, and an unchanged payload won't notify again.
+        self._handle_coordinator_update()
 
+    # update_entity is served by CoordinatorEntity.async_update, which asks the shared coordinator
+    # to refresh; zones updated together within CONTROLLER_CACHE_TTL reuse one getController poll.
+    @callback
     def _handle_coordinator_update(self) -> None:
-        log_prefix = self.entity_id or self._attr_name
         if not self.coordinator.last_update_success:
             if self._attr_available:
-                _LOGGER.warning("%s: Coordinator update failed, marking unavailable.", log_prefix)
+                _LOGGER.warning("%s: Coordinator update failed, marking unavailable.", self._log_prefix)
                 self._attr_available = False
-                self.async_write_ha_state()
+                self._schedule_write()
             return
-        data = self.coordinator.data
-        zone_data = None
-        if data:
-            for item in data:
-                if isinstance(item, dict) and item.get("num") == self._zone:
-                    zone_data = item
-                    break
+        zone_data = self.coordinator.data["by_zone"].get(self._zone) if self.coordinator.data else None
+        if (
+            zone_data is not None
+            and zone_data == self._last_zone_data
+            and self._attr_available
+            and self._state == (zone_data.get("pattern") != "off")
+        ):
+            # Nothing changed for this zone (another zone may have); skip the state write.
+            return
+        self._last_zone_data = zone_data
         if not zone_data:
-            _LOGGER.warning("%s: Zone data not found in coordinator update.", log_prefix)
+            _LOGGER.warning("%s: Zone data not found in coordinator update.", self._log_prefix)
             self._attr_available = False
-            self.async_write_ha_state()
+            self._schedule_write()
             return
         current_pattern = zone_data.get("pattern")
         if current_pattern is None:
-            _LOGGER.warning("%s: 'pattern' key missing in zone data: %s", log_prefix, zone_data)
+            _LOGGER.warning("%s: 'pattern' key missing in zone data: %s", self._log_prefix, zone_data)
             self._attr_available = False
-            self.async_write_ha_state()
+            self._schedule_write()
             return
         is_actually_on = current_pattern != "off"
         new_state = is_actually_on
@@ -222,18 +629,28 @@ class OeloLight(LightEntity, RestoreEntity):
         availability_changed = self._attr_available != new_availability
         if availability_changed:
             _LOGGER.info("%s: Availability changed via coordinator: %s -> %s",
-                        log_prefix, self._attr_available, new_availability)
+                        self._log_prefix, self._attr_available, new_availability)
             self._attr_available = new_availability
-        if self._attr_available and state_changed:
+        if state_changed and self._pending_command_url is not None:
+            # A newer command is still debouncing; its own confirmation refresh settles the state.
+            _LOGGER.debug("%s: Keeping optimistic state while a command is pending.", self._log_prefix)
+        elif self._attr_available and state_changed:
             _LOGGER.info("%s: State change via coordinator: %s -> %s (Pattern: '%s')",
-                        log_prefix, "On" if self._state else "Off", "On" if new_state else "Off", current_pattern)
+                        self._log_prefix, "On" if self._state else "Off", "On" if new_state else "Off", current_pattern)
             self._state = new_state
             if not new_state:
                 self._intended_effect = None
-        self.async_write_ha_state()
+        self._schedule_write()
+
+    @callback
+    def _schedule_write(self) -> None:
+        """Coalesce state writes issued in quick succession into a single write."""
+        if self._write_debouncer is None or self.entity_id is None:
+            return
+        self._write_debouncer.async_schedule_call()
 
-    async def _save_last_command_to_store(self):
-        log_prefix = self.entity_id or self._attr_name
+    @callback
+    def _save_last_command_to_store(self) -> None:
         if self.hass and self._entry.entry_id in self.hass.data.get(DOMAIN, {}):
             entry_hass_data = self.hass.data[DOMAIN][self._entry.entry_id]
             store: Store = entry_hass_data.get("store")
@@ -243,27 +660,25 @@ class OeloLight(LightEntity, RestoreEntity):
                 if self._last_successful_command is None:
                     if self._entity_store_key in stored_entity_data:
                         del stored_entity_data[self._entity_store_key]
-                        _LOGGER.debug("%s: Removed LSC from store for key %s", log_prefix, self._entity_store_key)
+                        _LOGGER.debug("%s: Removed LSC from store for key %s", self._log_prefix, self._entity_store_key)
                 else:
                     stored_entity_data[self._entity_store_key] = self._last_successful_command
                     _LOGGER.debug("%s: Updated LSC '%s' in store data for key %s",
-                                  log_prefix, self._last_successful_command, self._entity_store_key)
-                try:
-                    await store.async_save(stored_entity_data)
-                except Exception as e:
-                    _LOGGER.error("%s: Failed to save last command to store: %s", log_prefix, e)
+                                  self._log_prefix, self._last_successful_command, self._entity_store_key)
+                # Coalesce bursts (e.g. slider drags) into one disk write; flushed on removal.
+                store.async_delay_save(lambda: stored_entity_data, STORE_SAVE_DELAY)
             else:
-                _LOGGER.warning("%s: Store or stored_entity_data not found for saving LSC.", log_prefix)
+                _LOGGER.warning("%s: Store or stored_entity_data not found for saving LSC.", self._log_prefix)
 
     async def async_turn_on(self, **kwargs: Any) -> None:
-        log_prefix = self.entity_id or self._attr_name
-        _LOGGER.debug("%s: Turning on with kwargs: %s", log_prefix, kwargs)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("%s: Turning on with kwargs: %s", self._log_prefix, kwargs)
 
         if not self._attr_available and not self._state:
-             _LOGGER.warning("%s: Cannot turn on: Controller is unavailable and reported off.", log_prefix)
+             _LOGGER.warning("%s: Cannot turn on: Controller is unavailable and reported off.", self._log_prefix)
              return
         if not self._attr_available and self._state:
-             _LOGGER.warning("%s: Controller unavailable, but attempting turn on/update as state is ON.", log_prefix)
+             _LOGGER.warning("%s: Controller unavailable, but attempting turn on/update as state is ON.", self._log_prefix)
 
         url_to_send: str | None = None
         effect_to_set: str | None = self._intended_effect
@@ -275,82 +690,75 @@ class OeloLight(LightEntity, RestoreEntity):
         if ATTR_BRIGHTNESS in kwargs:
             try:
                 brightness_to_set = int(kwargs[ATTR_BRIGHTNESS])
-                _LOGGER.debug("%s: Brightness specified: %d", log_prefix, brightness_to_set)
+                _LOGGER.debug("%s: Brightness specified: %d", self._log_prefix, brightness_to_set)
             except (ValueError, TypeError):
-                _LOGGER.warning("%s: Invalid brightness value: %s, using default", log_prefix, kwargs[ATTR_BRIGHTNESS])
+                _LOGGER.warning("%s: Invalid brightness value: %s, using default", self._log_prefix, kwargs[ATTR_BRIGHTNESS])
                 brightness_to_set = 255
 
         brightness_to_set = max(0, min(brightness_to_set, 255))
+
         brightness_factor = brightness_to_set / 255.0
 
         if ATTR_RGB_COLOR in kwargs:
-            _LOGGER.debug("%s: RGB color specified: %s", log_prefix, kwargs[ATTR_RGB_COLOR])
+            _LOGGER.debug("%s: RGB color specified: %s", self._log_prefix, kwargs[ATTR_RGB_COLOR])
             try:
                 rgb_input = kwargs[ATTR_RGB_COLOR]
                 if isinstance(rgb_input, (list, tuple)) and len(rgb_input) == 3:
                     rgb_to_set = tuple(max(0, min(int(c), 255)) for c in rgb_input)
                 else:
-                    _LOGGER.warning("%s: Invalid RGB color format: %s, using current color", log_prefix, rgb_input)
+                    _LOGGER.warning("%s: Invalid RGB color format: %s, using current color", self._log_prefix, rgb_input)
                     rgb_to_set = self._rgb_color or (255, 255, 255)
             except (ValueError, TypeError):
-                _LOGGER.warning("%s: Invalid RGB color values: %s, using current color", log_prefix, kwargs[ATTR_RGB_COLOR])
+                _LOGGER.warning("%s: Invalid RGB color values: %s, using current color", self._log_prefix, kwargs[ATTR_RGB_COLOR])
                 rgb_to_set = self._rgb_color or (255, 255, 255)
             effect_to_set = None
             
-            scaled_color = tuple(max(0, min(int(round(c * brightness_factor)), 255)) for c in rgb_to_set)
-            url_params_send = {
-                 "patternType": "custom", "num_zones": 1, "zones": self._zone,
-                 "num_colors": 1, "colors": ','.join(map(str, scaled_color)),
-                 "direction": "F", "speed": 0, "gap": 0, "other": 0, "pause": 0
-            }
-            query_string_send = urllib.parse.urlencode(url_params_send)
-            url_to_send = f"http://{self.coordinator.ip}/setPattern?{query_string_send}"
-
-            url_params_lsc = url_params_send.copy()
-            url_params_lsc["colors"] = ','.join(map(str, rgb_to_set))
-            query_string_lsc = urllib.parse.urlencode(url_params_lsc)
-            base_command_for_lsc = f"http://{self.coordinator.ip}/setPattern?{query_string_lsc}"
+            scaled_color = (
+                _scale(brightness_to_set, rgb_to_set[0]),
+                _scale(brightness_to_set, rgb_to_set[1]),
+                _scale(brightness_to_set, rgb_to_set[2]),
+            )
+            url_to_send = self._solid_template.format(colors=f"{scaled_color[0]},{scaled_color[1]},{scaled_color[2]}")
+            base_command_for_lsc = self._solid_template.format(colors=f"{rgb_to_set[0]},{rgb_to_set[1]},{rgb_to_set[2]}")
 
         elif ATTR_EFFECT in kwargs:
             selected_effect = kwargs[ATTR_EFFECT]
             triggered_by_effect_kwarg = True
-            _LOGGER.debug("%s: Effect specified: %s", log_prefix, selected_effect)
+            _LOGGER.debug("%s: Effect specified: %s", self._log_prefix, selected_effect)
             if selected_effect in pattern_commands:
                 effect_to_set = selected_effect
                 base_command_for_lsc = self._get_base_effect_url(selected_effect)
                 if base_command_for_lsc:
-                    extracted_rgb = self._extract_first_color_from_url(base_command_for_lsc)
+                    extracted_rgb = _EFFECT_FIRST_RGB.get(selected_effect)
                     if extracted_rgb: 
                         rgb_to_set = extracted_rgb
                     else: 
-                        _LOGGER.warning("%s: No base RGB for effect '%s', color may be default.", log_prefix, selected_effect)
+                        _LOGGER.warning("%s: No base RGB for effect '%s', color may be default.", self._log_prefix, selected_effect)
                     url_to_send = self._adjust_colors_in_url(base_command_for_lsc, brightness_factor)
                 else:
-                    _LOGGER.error("%s: Could not get base URL for effect '%s'", log_prefix, selected_effect)
+                    _LOGGER.error("%s: Could not get base URL for effect '%s'", self._log_prefix, selected_effect)
                     return
             else:
-                _LOGGER.error("%s: Invalid effect: '%s'. Valid: %s", log_prefix, selected_effect, list(pattern_commands.keys()))
+                _LOGGER.error("%s: Invalid effect: '%s'. Valid: %s", self._log_prefix, selected_effect, list(pattern_commands.keys()))
                 return
 
         elif not self._state or ATTR_BRIGHTNESS in kwargs:
-            _LOGGER.debug("%s: Turning on from OFF or adjusting brightness only.", log_prefix)
+            _LOGGER.debug("%s: Turning on from OFF or adjusting brightness only.", self._log_prefix)
             
             if effect_to_set and not triggered_by_effect_kwarg:
-                _LOGGER.debug("%s: Replaying stored effect '%s'", log_prefix, effect_to_set)
+                _LOGGER.debug("%s: Replaying stored effect '%s'", self._log_prefix, effect_to_set)
                 base_command_for_lsc = self._get_base_effect_url(effect_to_set)
                 if base_command_for_lsc:
-                    extracted_rgb = self._extract_first_color_from_url(base_command_for_lsc)
+                    extracted_rgb = _EFFECT_FIRST_RGB.get(effect_to_set)
                     if extracted_rgb: 
                         rgb_to_set = extracted_rgb
                 else:
                     effect_to_set = None
             
             if not base_command_for_lsc and self._last_successful_command:
-                 _LOGGER.debug("%s: Replaying last successful command for ON.", log_prefix)
+                 _LOGGER.debug("%s: Replaying last successful command for ON.", self._log_prefix)
                  base_command_for_lsc = self._last_successful_command
-                 parsed_lsc = urllib.parse.urlparse(base_command_for_lsc)
-                 lsc_params = urllib.parse.parse_qs(parsed_lsc.query)
-                 lsc_pattern_type = lsc_params.get("patternType", [""])[0]
+                 lsc_pattern_type = _query_value(base_command_for_lsc, "patternType")
                  
                  extracted_rgb_lsc = self._extract_first_color_from_url(base_command_for_lsc)
                  if extracted_rgb_lsc: 
@@ -359,37 +767,16 @@ class OeloLight(LightEntity, RestoreEntity):
                  if lsc_pattern_type == "custom": 
                      effect_to_set = None
                  elif lsc_pattern_type != "off":
-                     found_effect_name = False
-                     for name, cmd_url_template in pattern_commands.items():
-                         try:
-                             parsed_template_url = urllib.parse.urlparse(cmd_url_template)
-                             template_params = urllib.parse.parse_qs(parsed_template_url.query)
-                             if template_params.get("patternType", [""])[0] == lsc_pattern_type:
-                                 effect_to_set = name
-                                 found_effect_name = True
-                                 break
-                         except Exception: 
-                             pass
-                     if not found_effect_name: 
-                         effect_to_set = None
+                     effect_to_set = _PATTERNTYPE_TO_EFFECT.get(lsc_pattern_type)
 
             if base_command_for_lsc:
                 url_to_send = self._adjust_colors_in_url(base_command_for_lsc, brightness_factor)
             else:
-                 _LOGGER.debug("%s: Fallback to Solid White.", log_prefix)
+                 _LOGGER.debug("%s: Fallback to Solid White.", self._log_prefix)
                  effect_to_set = None
                  rgb_to_set = (255, 255, 255)
-                 scaled_color = tuple(max(0, min(int(round(c * brightness_factor)), 255)) for c in rgb_to_set)
-                 url_params_send = {
-                     "patternType": "custom", "num_zones": 1, "zones": self._zone,
-                     "num_colors": 1, "colors": ','.join(map(str, scaled_color)),
-                     "direction": "F", "speed": 0, "gap": 0, "other": 0, "pause": 0
-                 }
-                 url_to_send = f"http://{self.coordinator.ip}/setPattern?{urllib.parse.urlencode(url_params_send)}"
-                 
-                 url_params_lsc = url_params_send.copy()
-                 url_params_lsc["colors"] = "255,255,255"
-                 base_command_for_lsc = f"http://{self.coordinator.ip}/setPattern?{urllib.parse.urlencode(url_params_lsc)}"
+                 base_command_for_lsc = self._white_url
+                 url_to_send = self._adjust_colors_in_url(base_command_for_lsc, brightness_factor)
 
         self._state = True
         self._brightness = brightness_to_set
@@ -400,335 +787,266 @@ class OeloLight(LightEntity, RestoreEntity):
         if base_command_for_lsc:
             if self._last_successful_command != base_command_for_lsc:
                 self._last_successful_command = base_command_for_lsc
-                await self._save_last_command_to_store()
+                self._save_last_command_to_store()
         elif self._last_successful_command is not None: 
             self._last_successful_command = None
-            await self._save_last_command_to_store()
+            self._save_last_command_to_store()
 
 
-        _LOGGER.debug("%s: Optimistic: On=%s, Bright=%s, Effect=%s, RGB=%s, LSC=%s",
-                      log_prefix, self._state, self._brightness, self._intended_effect, self._rgb_color, self._last_successful_command)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("%s: Optimistic: On=%s, Bright=%s, Effect=%s, RGB=%s, LSC=%s",
+                          self._log_prefix, self._state, self._brightness, self._intended_effect, self._rgb_color, self._last_successful_command)
         
-        if self.hass is not None and self.entity_id is not None:
-            self.async_write_ha_state()
+        self._schedule_write()
 
         if url_to_send:
-            try:
-                actual_send_success = await self._buffered_send_request(url_to_send)
-                if actual_send_success:
-                    _LOGGER.info("%s: Turn_on command sent successfully via buffer.", log_prefix)
-                    if not self._attr_available:
-                        _LOGGER.info("%s: Marking available after successful turn_on.", log_prefix)
-                        self._attr_available = True
-                        if self.hass is not None and self.entity_id is not None: 
-                            self.async_write_ha_state()
-                else:
-                    _LOGGER.error("%s: Turn_on command failed via buffer.", log_prefix)
-                    if self._attr_available:
-                        _LOGGER.warning("%s: Marking unavailable after failed turn_on.", log_prefix)
-                        self._attr_available = False
-                        if self.hass is not None and self.entity_id is not None: 
-                            self.async_write_ha_state()
-            except asyncio.CancelledError:
-                _LOGGER.debug("%s: Turn_on command superseded. Optimistic state remains.", log_prefix)
-            except Exception as e:
-                _LOGGER.error("%s: Error during _buffered_send_request for turn_on: %s", log_prefix, e, exc_info=True)
-                if self._attr_available:
-                    self._attr_available = False
-                    if self.hass is not None and self.entity_id is not None: 
-                        self.async_write_ha_state()
+            self._buffered_send_request(url_to_send, "Turn_on")
         else:
-             _LOGGER.debug("%s: Turn on called, no URL generated.", log_prefix)
+             _LOGGER.debug("%s: Turn on called, no URL generated.", self._log_prefix)
              if not self._attr_available:
                  self._attr_available = True
-                 if self.hass is not None and self.entity_id is not None: 
-                     self.async_write_ha_state()
+                 self._schedule_write()
 
 
     async def async_turn_off(self, **kwargs: Any) -> None:
-        log_prefix = self.entity_id or self._attr_name
-        _LOGGER.debug("%s: Turning off", log_prefix)
+        _LOGGER.debug("%s: Turning off", self._log_prefix)
 
         if not self._state and not self._attr_available:
-            _LOGGER.debug("%s: Already off and unavailable.", log_prefix)
+            _LOGGER.debug("%s: Already off and unavailable.", self._log_prefix)
             return
         if not self._state and self._attr_available:
-            _LOGGER.debug("%s: Already off.", log_prefix)
+            _LOGGER.debug("%s: Already off.", self._log_prefix)
             return
         
         if not self._attr_available and self._state:
-             _LOGGER.warning("%s: Unavailable but ON. Attempting turn off.", log_prefix)
+             _LOGGER.warning("%s: Unavailable but ON. Attempting turn off.", self._log_prefix)
 
         self._state = False
-        _LOGGER.debug("%s: Optimistic: Off", log_prefix)
-        if self.hass is not None and self.entity_id is not None:
-            self.async_write_ha_state()
+        _LOGGER.debug("%s: Optimistic: Off", self._log_prefix)
+        self._schedule_write()
+
+        self._buffered_send_request(self._off_url, "Turn_off")
 
-        url_params = {
-            "patternType": "off", "num_zones": 1, "zones": self._zone,
-            "num_colors": 1, "colors": "0,0,0",
-            "direction": "F", "speed": 0, "gap": 0, "other": 0, "pause": 0
-        }
-        url = f"http://{self.coordinator.ip}/setPattern?{urllib.parse.urlencode(url_params)}"
 
+    async def _send_and_confirm(self, url: str, action: str) -> None:
         try:
-            actual_send_success = await self._buffered_send_request(url)
-            if actual_send_success:
-                _LOGGER.info("%s: Turn_off command sent successfully via buffer.", log_prefix)
-                if not self._attr_available:
-                    _LOGGER.info("%s: Marking available after successful turn_off.", log_prefix)
-                    self._attr_available = True
-                    if self.hass is not None and self.entity_id is not None: 
-                        self.async_write_ha_state()
-            else:
-                _LOGGER.error("%s: Turn_off command failed via buffer.", log_prefix)
-                if self._attr_available:
-                    _LOGGER.warning("%s: Marking unavailable after failed turn_off.", log_prefix)
-                    self._attr_available = False
-                    if self.hass is not None and self.entity_id is not None: 
-                        self.async_write_ha_state()
+            actual_send_success = await self._send_request(url)
         except asyncio.CancelledError:
-            _LOGGER.debug("%s: Turn_off command superseded. Optimistic state remains.", log_prefix)
+            _LOGGER.debug("%s: %s command cancelled. Optimistic state remains.", self._log_prefix, action)
+            raise
         except Exception as e:
-            _LOGGER.error("%s: Error during _buffered_send_request for turn_off: %s", log_prefix, e, exc_info=True)
+            _LOGGER.error("%s: Error sending %s command: %r", self._log_prefix, action, e,
+                          exc_info=_LOGGER.isEnabledFor(logging.DEBUG))
             if self._attr_available:
                 self._attr_available = False
-                if self.hass is not None and self.entity_id is not None: 
-                    self.async_write_ha_state()
+                self._schedule_write()
+            return
+
+        if actual_send_success:
+            _LOGGER.info("%s: %s command sent successfully via buffer.", self._log_prefix, action)
+            if not self._attr_available:
+                _LOGGER.info("%s: Marking available after successful %s.", self._log_prefix, action)
+                self._attr_available = True
+                self._schedule_write()
+            # Let the next poll confirm (or correct) the optimistic state.
+            await self.coordinator.async_request_refresh()
+        elif self._attr_available:
+            _LOGGER.warning("%s: %s command failed; marking unavailable.", self._log_prefix, action)
+            self._attr_available = False
+            self._schedule_write()
+        else:
+            _LOGGER.debug("%s: %s command failed while unavailable.", self._log_prefix, action)
 
 
     def _get_base_effect_url(self, effect_name: str) -> str | None:
-        log_prefix = self.entity_id or self._attr_name
+        cached_url = self._effect_url_cache.get(effect_name)
+        if cached_url is not None:
+            return cached_url
         if effect_name not in pattern_commands:
-            _LOGGER.error("%s: Effect '%s' not in pattern_commands", log_prefix, effect_name)
+            _LOGGER.error("%s: Effect '%s' not in pattern_commands", self._log_prefix, effect_name)
             return None
 
-        base_template = pattern_commands[effect_name]
-        if not isinstance(base_template, str):
-             _LOGGER.error("%s: Pattern for '%s' is not str: %s", log_prefix, effect_name, base_template)
+        template = _PATTERN_TEMPLATES.get(effect_name)
+        if template is None:
+             _LOGGER.error("%s: Pattern for '%s' is not a zone template: %s", self._log_prefix, effect_name, pattern_commands[effect_name])
              return None
 
-        try:
-            parsed_template = urllib.parse.urlparse(base_template)
-            template_query = urllib.parse.parse_qs(parsed_template.query, keep_blank_values=True)
-
-            template_query['zones'] = [str(self._zone)]
-            template_query['num_zones'] = ['1']
-
-            final_query_str = urllib.parse.urlencode(template_query, doseq=True)
-            
-            path = parsed_template.path if parsed_template.path else "/setPattern"
-
-            final_url = urllib.parse.urlunparse(
-                ('http', self.coordinator.ip, path, parsed_template.params, final_query_str, parsed_template.fragment)
-            )
-            _LOGGER.debug("%s: Constructed base URL for effect '%s': %s", log_prefix, effect_name, final_url)
-            return final_url
-
-        except Exception as e:
-            _LOGGER.error("%s: Error building URL for effect '%s' from '%s': %s",
-                          log_prefix, effect_name, base_template, e)
-            return None
+        # Templates are single-zone commands with a {zone} slot; colours keep their raw commas.
+        # _PATTERN_TEMPLATES only holds strings, so building the URL cannot fail here.
+        final_url = self._base + template.replace("{zone}", str(self._zone))
+        _LOGGER.debug("%s: Constructed base URL for effect '%s': %s", self._log_prefix, effect_name, final_url)
+        self._effect_url_cache[effect_name] = final_url
+        return final_url
 
 
     def _extract_first_color_from_url(self, url: str) -> tuple[int, int, int] | None:
-        log_prefix = self.entity_id or self._attr_name
         if not url: 
             return None
-        try:
-            query_params = urllib.parse.parse_qs(urllib.parse.urlparse(url).query)
-            if 'colors' in query_params and query_params['colors'] and query_params['colors'][0]:
-                colors_str = query_params['colors'][0]
-                color_parts = colors_str.split(',')
-                if len(color_parts) >= 3:
-                    try:
-                        color_values = [max(0, min(int(c.strip()), 255)) for c in color_parts[:3]]
-                        return tuple(color_values)
-                    except (ValueError, TypeError):
-                        _LOGGER.debug("%s: Invalid color values in '%s' from %s", log_prefix, colors_str, url)
-                else:
-                    _LOGGER.debug("%s: Not enough numeric values in colors='%s' from %s", log_prefix, colors_str, url)
-            else:
-                _LOGGER.debug("%s: No 'colors' param or empty in %s", log_prefix, url)
-        except ValueError as e:
-            _LOGGER.error("%s: Invalid color value parsing 'colors' from %s: %s", log_prefix, url, e)
-        except Exception as e:
-            _LOGGER.error("%s: Error parsing color from URL '%s': %s", log_prefix, url, e)
-        return None
+        colors_str = _query_value(url, "colors")
+        if not colors_str:
+            _LOGGER.debug("%s: No 'colors' param or empty in %s", self._log_prefix, url)
+            return None
+        first = _first_rgb(colors_str)
+        if first is None:
+            _LOGGER.debug("%s: No valid first colour in colors='%s' from %s", self._log_prefix, colors_str, url)
+        return first
 
 
     async def _send_request(self, url: str) -> bool:
-        log_prefix = self.entity_id or self._attr_name
-        _LOGGER.debug("%s: Sending request: %s", log_prefix, url)
-        try:
-            async with async_timeout.timeout(10):
-                session = self.coordinator.session
-                if session is None or session.closed:
-                     _LOGGER.error("%s: HTTP session closed/invalid for send request.", log_prefix)
-                     return False
-
-                async with session.get(url) as response:
-                    resp_text = await response.text()
-                    response.raise_for_status()
-
-                    if "Command Received" in resp_text:
-                         _LOGGER.info("%s: Request OK (Status: %d, Resp: '%s')", log_prefix, response.status, resp_text.strip()[:50])
-                         return True
-                    else:
-                         _LOGGER.warning("%s: Request OK (Status: %d), but unexpected response: '%s'", log_prefix, response.status, resp_text.strip()[:50])
-                         return True
-        except asyncio.TimeoutError:
-            _LOGGER.error("%s: Request timed out: %s", log_prefix, url)
-            return False
-        except aiohttp.ClientResponseError as err:
-            _LOGGER.error("%s: HTTP request failed: %s (%s)", log_prefix, err, url)
-            return False
-        except aiohttp.ClientConnectionError as err:
-             _LOGGER.error("%s: HTTP connection failed: %s (%s)", log_prefix, err, url)
-             return False
-        except aiohttp.ClientError as err:
-            _LOGGER.error("%s: HTTP client error: %s (%s)", log_prefix, err, url)
-            return False
-        except Exception as err:
-            _LOGGER.exception("%s: Unexpected error during request: %s (%s)", log_prefix, err, url)
-            return False
+        return await self.coordinator.async_queue_command(self._zone, url)
 
 
     def _adjust_colors_in_url(self, url: str, brightness_factor: float) -> str:
-        log_prefix = self.entity_id or self._attr_name
         if not url:
-            _LOGGER.warning("%s: Empty URL to adjust colors.", log_prefix)
+            _LOGGER.warning("%s: Empty URL to adjust colors.", self._log_prefix)
             return ""
-        brightness_factor = max(0.0, min(brightness_factor, 1.0))
-
-        try:
-            parsed_url = urllib.parse.urlparse(url)
-            query_params = urllib.parse.parse_qs(parsed_url.query, keep_blank_values=True)
-
-            if 'colors' in query_params and query_params['colors'][0]:
-                colors_str_list = query_params['colors'][0].split(',')
-                original_colors_int = []
-                for c_str in colors_str_list:
-                    c_str_stripped = c_str.strip()
-                    if c_str_stripped.isdigit():
-                        original_colors_int.append(int(c_str_stripped))
-
-                if not original_colors_int:
-                    _LOGGER.warning("%s: No numeric colors in '%s' from %s", log_prefix, query_params['colors'][0], url)
-                    return url
-
-                if len(original_colors_int) % 3 != 0:
-                    _LOGGER.warning("%s: Color count %d not multiple of 3 in %s", log_prefix, len(original_colors_int), url)
-
-                adjusted_colors = [max(0, min(int(round(v * brightness_factor)), 255)) for v in original_colors_int]
-                query_params['colors'] = [','.join(map(str, adjusted_colors))]
-            else:
-                _LOGGER.debug("%s: No 'colors' param to adjust in %s", log_prefix, url)
-                return urllib.parse.urlunparse(parsed_url._replace(scheme='http', netloc=self.coordinator.ip))
-
-
-            new_query = urllib.parse.urlencode(query_params, doseq=True)
-            new_url = urllib.parse.urlunparse(
-                parsed_url._replace(scheme='http', netloc=self.coordinator.ip, query=new_query)
-            )
-            _LOGGER.debug("%s: Adjusted URL (bright %.2f): %s", log_prefix, brightness_factor, new_url)
+        if brightness_factor >= 1.0 - 1e-6:
+            # Full brightness sends the stored colours as they are.
+            return self._on_current_host(url)
+        if '?' not in url:
+            # No query string means no colors to scale; don't cache a renderer for it.
+            return self._on_current_host(url)
+        brightness_factor = max(0.0, brightness_factor)
+        level = int(round(brightness_factor * 255))
+
+        render = self._url_cache.pop(url, None)
+        if render is None:
+            render = self._compile_color_renderer(url)
+            if len(self._url_cache) >= URL_CACHE_SIZE:
+                del self._url_cache[next(iter(self._url_cache))]
+        # Re-inserting keeps the most recently used URLs at the end of the dict.
+        self._url_cache[url] = render
+
+        new_url = render(level)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("%s: Adjusted URL (bright %.2f): %s", self._log_prefix, brightness_factor, new_url)
+        return new_url
+
+
+    def _compile_color_renderer(self, url: str) -> Callable[[int], str]:
+        """Split a command URL once and return a function rendering it at a 0-255 brightness level."""
+        prefix, colors, suffix = _split_colors_param(self._on_current_host(url))
+        if not colors:
+            _LOGGER.debug("%s: No numeric 'colors' to adjust in %s", self._log_prefix, url)
+            unchanged = prefix + suffix
+            return lambda _level: unchanged
+        if len(colors) % 3 != 0:
+            _LOGGER.warning("%s: Color count %d not multiple of 3 in %s", self._log_prefix, len(colors), url)
+
+        # One byte per channel lets bytes.translate rescale the whole list in C.
+        channel_bytes = bytes(min(v, 255) for v in colors)
+
+        def scale(level: int) -> str:
+            return ','.join(map(str, channel_bytes.translate(self._brightness_table(level))))
+
+        off_url = f"{prefix}{','.join('0' * len(colors))}{suffix}"
+        # Slider nudges revisit the same few levels; remember what each one rendered to.
+        rendered: dict[int, str] = {0: off_url}
+
+        def render(level: int) -> str:
+            new_url = rendered.get(level)
+            if new_url is None:
+                if len(rendered) >= RENDER_CACHE_SIZE:
+                    rendered.clear()
+                    rendered[0] = off_url
+                new_url = rendered[level] = f"{prefix}{scale(level)}{suffix}"
             return new_url
 
-        except Exception as e:
-            _LOGGER.exception("%s: Error adjusting colors in URL '%s': %s", log_prefix, url, e)
-            try:
-                 return urllib.parse.urlunparse(urllib.parse.urlparse(url)._replace(scheme='http', netloc=self.coordinator.ip))
-            except Exception:
-                 return url
-
-
-    async def _buffered_send_request(self, url: str) -> bool:
-        log_prefix = self.entity_id or self._attr_name
-        loop = asyncio.get_running_loop()
+        return render
+
+
+    def _brightness_table(self, level: int) -> bytes:
+        """Return the _BRIGHT_LUT row for a 0-255 brightness level, reusing the last one while it is unchanged."""
+        if level != self._brightness_lut_level:
+            self._brightness_lut = _BRIGHT_LUT[level * 256:(level + 1) * 256]
+            self._brightness_lut_level = level
+        return self._brightness_lut
+
+
+    def _on_current_host(self, url: str) -> str:
+        """Point a (possibly restored) command URL at the current controller IP."""
+        base = self._base
+        if url.startswith(base + "/"):
+            return url
+        # Command URLs are generated here, so a plain split on the host is enough.
+        _, sep, rest = url.partition("://")
+        if sep:
+            slash = rest.find("/")
+            rest = rest[slash:] if slash != -1 else "/"
+        elif not url.startswith("/"):
+            rest = "/" + url
+        else:
+            rest = url
+        return base + rest
 
-        if self._debounce_task and not self._debounce_task.done():
-            _LOGGER.debug("%s: Cancelling previous debounce task.", log_prefix)
-            self._debounce_task.cancel()
 
-        if self._pending_command_future and not self._pending_command_future.done():
-            _LOGGER.debug("%s: Cancelling previous pending command future.", log_prefix)
-            self._pending_command_future.cancel()
+    @callback
+    def _buffered_send_request(self, url: str, action: str) -> None:
+        """Queue a command; only the newest one is sent once commands stop arriving.
 
+        The service call returns right after the optimistic write; the sender
+        loop delivers the command and _send_and_confirm handles the outcome.
+        """
         self._pending_command_url = url
-        current_call_future = loop.create_future()
-        self._pending_command_future = current_call_future
-
-        self._debounce_task = loop.create_task(self._debounce_and_send())
-
-        try:
-            result = await current_call_future
-            return result
-        except asyncio.CancelledError:
-            _LOGGER.debug("%s: This buffered request call was cancelled (superseded).", log_prefix)
-            raise
-
-
-    async def _debounce_and_send(self):
-        log_prefix = self.entity_id or self._attr_name
-        try:
-            await asyncio.sleep(self._debounce_interval)
+        self._pending_action = action
+
+        # Push the deadline back; the sender loop re-checks it before sending.
+        now = self.hass.loop.time()
+        self._debounce_deadline = now + COMMAND_DEBOUNCE_INTERVAL
+        if self._first_pending_ts is None:
+            self._first_pending_ts = now
+        self._wake.set()
+
+
+    async def _sender_loop(self) -> None:
+        """Send the newest pending command once the debounce interval has passed, one at a time."""
+        loop = self.hass.loop
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+
+            while True:
+                now = loop.time()
+                remaining = self._debounce_deadline - now
+                if self._first_pending_ts is not None:
+                    # A continuous stream of commands still goes out every COMMAND_MAX_DELAY seconds.
+                    remaining = min(remaining, COMMAND_MAX_DELAY - (now - self._first_pending_ts))
+                if remaining <= 0:
+                    break
+                await asyncio.sleep(remaining)
 
+            self._first_pending_ts = None
             url_to_send_now = self._pending_command_url
-            future_to_resolve_now = self._pending_command_future
-
-            if url_to_send_now is None or future_to_resolve_now is None:
-                _LOGGER.warning("%s: Debounce task woke up with no command/future.", log_prefix)
-                return
+            self._pending_command_url = None
+            if url_to_send_now is None:
+                continue
 
-            if future_to_resolve_now.cancelled():
-                _LOGGER.debug("%s: Debounce task future was already cancelled before send.", log_prefix)
-                return
-            
-            if future_to_resolve_now.done():
-                _LOGGER.debug("%s: Debounce task future was already done before send (unexpected).", log_prefix)
-                return
-
-            _LOGGER.debug("%s: Debounce finished. Sending actual URL: %s", log_prefix, url_to_send_now)
-            send_result = await self._send_request(url_to_send_now)
-
-            if not future_to_resolve_now.done():
-                future_to_resolve_now.set_result(send_result)
-            else:
-                _LOGGER.debug("%s: Future for URL %s was done/cancelled while send was in progress.", log_prefix, url_to_send_now)
-
-        except asyncio.CancelledError:
-            _LOGGER.debug("%s: Debounce task itself cancelled (new command came in).", log_prefix)
-        except Exception as e:
-            _LOGGER.error("%s: Error in _debounce_and_send: %s", log_prefix, e, exc_info=True)
-            if self._pending_command_future and not self._pending_command_future.done():
-                self._pending_command_future.set_result(False)
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("%s: Debounce finished. Sending actual URL: %s", self._log_prefix, url_to_send_now)
+            try:
+                await self._send_and_confirm(url_to_send_now, self._pending_action)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                _LOGGER.exception("%s: Unexpected error in sender loop", self._log_prefix)
 
 
     async def async_will_remove_from_hass(self) -> None:
         """Clean up resources when entity is removed."""
         try:
-            if self._debounce_task and not self._debounce_task.done():
-                self._debounce_task.cancel()
-                try:
-                    await self._debounce_task
-                except asyncio.CancelledError:
-                    pass
-            
-            if self._pending_command_future and not self._pending_command_future.done():
-                self._pending_command_future.cancel()
+            if self._write_debouncer is not None:
+                self._write_debouncer.async_cancel()
+                self._write_debouncer = None
+
+            if self._sender_task is not None:
+                self._sender_task.cancel()
+                self._sender_task = None
+
+            entry_hass_data = self.hass.data.get(DOMAIN, {}).get(self._entry.entry_id)
+            if entry_hass_data and entry_hass_data.get("store"):
+                await entry_hass_data["store"].async_save(entry_hass_data["stored_entity_data"])
             
         except Exception as e:
-            _LOGGER.debug("%s: Error during cleanup: %s", self.entity_id or self._attr_name, e)
+            _LOGGER.debug("%s: Error during cleanup: %s", self._log_prefix, e)
         finally:
             await super().async_will_remove_from_hass()
-            
-
-async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Handle unloading of a config entry."""
-    if DOMAIN in hass.data and entry.entry_id in hass.data[DOMAIN]:
-        del hass.data[DOMAIN][entry.entry_id]
-        if not hass.data[DOMAIN]:
-            del hass.data[DOMAIN]
-        _LOGGER.info("Unloaded Oelo Lights entry %s", entry.entry_id)
-
-    return await hass.config_entries.async_unload_platforms(entry, ["light"])
\ No newline at end of file